@@ -16,7 +16,7 @@ from app.services.batch import (
     archive_batch,
     unarchive_batch
 )
-from app.services.transaction import list_transactions
+from app.services.transaction import iter_transactions
 from app.services.csv_parser import get_parser, CSVGenerator
 import sqlite3
 
@@ -239,9 +239,9 @@ def download_batch(
     if not batch or batch['user_id'] != user['id']:
         raise HTTPException(status_code=404, detail="Batch not found")
 
-    # Get all transactions
+    # Get all transactions (streamed straight into the CSV generator)
     try:
-        transactions = list_transactions(db, batch_id, user['id'])
+        transactions = iter_transactions(db, batch_id, user['id'])
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
@@ -2,8 +2,8 @@
 Backup service for database backups
 """
 
-import shutil
 import os
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 
@@ -12,6 +12,9 @@ def backup_database(source_path: str, dest_dir: str) -> str:
     """
     Create a backup copy of the database file
 
+    Uses SQLite's online backup API, so the copy is consistent (including any
+    data still in the WAL) even while the app is writing to the database.
+
     Args:
         source_path: Path to the source database file
         dest_dir: Directory to save the backup to
@@ -37,9 +40,17 @@ def backup_database(source_path: str, dest_dir: str) -> str:
     backup_filename = f"{name_without_ext}_backup_{timestamp}.db"
     dest_path = os.path.join(dest_dir, backup_filename)
 
-    # Copy the database file
+    # Copy the database page by page into the backup file
     try:
-        shutil.copy2(source_path, dest_path)
+        source = sqlite3.connect(source_path)
+        try:
+            dest = sqlite3.connect(dest_path)
+            try:
+                source.backup(dest)
+            finally:
+                dest.close()
+        finally:
+            source.close()
     except Exception as e:
         raise IOError(f"Failed to create backup: {str(e)}")
 
@@ -3,10 +3,59 @@ Batch service layer - Business logic for batch management
 """
 
 import sqlite3
-from datetime import datetime
 from typing import List, Optional, Tuple
 
 
+# Fixed SQL kept as module constants so every call passes the identical string
+# and hits the connection's prepared-statement cache
+# Batch row plus its progress counts in one query
+SQL_GET_BATCH_WITH_PROGRESS = """
+    SELECT b.id, b.name, b.user_id, b.status, b.date_range_start, b.date_range_end,
+           b.created_at, b.updated_at,
+           COUNT(t.id),
+           SUM(CASE WHEN t.category IS NOT NULL THEN 1 ELSE 0 END)
+    FROM batches b
+    LEFT JOIN transactions t ON t.batch_id = b.id
+    WHERE b.id = ?
+    GROUP BY b.id
+"""
+
+# A user's batches with progress counts (one query instead of one per batch)
+SQL_LIST_BATCHES = """
+    SELECT b.id, b.name, b.user_id, b.status, b.date_range_start, b.date_range_end,
+           b.created_at, b.updated_at,
+           COUNT(t.id),
+           SUM(CASE WHEN t.category IS NOT NULL THEN 1 ELSE 0 END)
+    FROM batches b
+    LEFT JOIN transactions t ON t.batch_id = b.id
+    WHERE b.user_id = ?
+    GROUP BY b.id
+    ORDER BY b.created_at DESC, b.id DESC
+"""
+
+SQL_LIST_ACTIVE_BATCHES = """
+    SELECT b.id, b.name, b.user_id, b.status, b.date_range_start, b.date_range_end,
+           b.created_at, b.updated_at,
+           COUNT(t.id),
+           SUM(CASE WHEN t.category IS NOT NULL THEN 1 ELSE 0 END)
+    FROM batches b
+    LEFT JOIN transactions t ON t.batch_id = b.id
+    WHERE b.user_id = ? AND b.status != 'archived'
+    GROUP BY b.id
+    ORDER BY b.created_at DESC, b.id DESC
+"""
+
+SQL_GET_BATCH_OWNER = "SELECT user_id FROM batches WHERE id = ?"
+
+# Does the batch have any transactions, and any uncategorized ones?
+# (both are index seeks; the second one on idx_transactions_batch_status_date)
+SQL_BATCH_COMPLETION_PROBE = """
+    SELECT EXISTS (SELECT 1 FROM transactions WHERE batch_id = ?),
+           EXISTS (SELECT 1 FROM transactions
+                   WHERE batch_id = ? AND status = 'uncategorized')
+"""
+
+
 def create_batch(
     db: sqlite3.Connection,
     name: str,
@@ -53,25 +102,25 @@ def create_batch(
 
     batch_id = cursor.lastrowid
 
-    # Bulk insert transactions
-    for txn in transactions:
-        # Determine status based on whether original_category exists
-        original_category = txn.get('original_category', '')
-        status = 'categorized' if original_category else 'uncategorized'
-
-        db.execute("""
-            INSERT INTO transactions (
-                batch_id, date, payee, amount, category, note, status
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
+    # Bulk insert transactions with one prepared statement; rows are generated
+    # lazily so no second list of parameter tuples is built
+    # (status is categorized when the CSV already had a category)
+    db.executemany("""
+        INSERT INTO transactions (
+            batch_id, date, payee, amount, category, note, status
+        ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, (
+        (
             batch_id,
             txn['date'],
             txn['payee'],
             txn['amount'],
-            original_category or None,
-            txn.get('original_comment', '') or None,
-            status
-        ))
+            txn.get('original_category') or None,
+            txn.get('original_comment') or None,
+            'categorized' if txn.get('original_category') else 'uncategorized'
+        )
+        for txn in transactions
+    ))
 
     db.commit()
 
@@ -89,12 +138,7 @@ def get_batch_by_id(db: sqlite3.Connection, batch_id: int) -> Optional[dict]:
     Returns:
         Batch dict with progress fields, or None if not found
     """
-    cursor = db.execute("""
-        SELECT id, name, user_id, status, date_range_start, date_range_end,
-               created_at, updated_at
-        FROM batches
-        WHERE id = ?
-    """, (batch_id,))
+    cursor = db.execute(SQL_GET_BATCH_WITH_PROGRESS, (batch_id,))
 
     row = cursor.fetchone()
     if not row:
@@ -112,9 +156,8 @@ def get_batch_by_id(db: sqlite3.Connection, batch_id: int) -> Optional[dict]:
         'updated_at': row[7]
     }
 
-    # Add progress information
-    progress = get_batch_progress(db, batch_id)
-    batch.update(progress)
+    # Add progress information (counted by the same query)
+    batch.update(_progress_fields(row[8], row[9]))
 
     return batch
 
@@ -135,24 +178,11 @@ def list_batches(
     Returns:
         List of batch dicts with progress fields
     """
-    # Build query
-    query = """
-        SELECT id, name, user_id, status, date_range_start, date_range_end,
-               created_at, updated_at
-        FROM batches
-        WHERE user_id = ?
-    """
-    params = [user_id]
-
-    if not include_archived:
-        query += " AND status != 'archived'"
-
-    query += " ORDER BY created_at DESC"
-
-    cursor = db.execute(query, params)
+    query = SQL_LIST_BATCHES if include_archived else SQL_LIST_ACTIVE_BATCHES
+    cursor = db.execute(query, (user_id,))
     rows = cursor.fetchall()
 
-    # Convert to dicts with progress
+    # Convert to dicts with progress (counted by the same query)
     batches = []
     for row in rows:
         batch = {
@@ -166,9 +196,7 @@ def list_batches(
             'updated_at': row[7]
         }
 
-        # Add progress information
-        progress = get_batch_progress(db, batch['id'])
-        batch.update(progress)
+        batch.update(_progress_fields(row[8], row[9]))
 
         batches.append(batch)
 
@@ -187,12 +215,14 @@ def delete_batch(db: sqlite3.Connection, batch_id: int, user_id: int) -> None:
     Raises:
         ValueError: If batch not found or not owned by user
     """
-    # Verify ownership
-    if not verify_batch_ownership(db, batch_id, user_id):
+    # Delete batch only if owned by the user, in one statement (CASCADE removes transactions)
+    cursor = db.execute(
+        "DELETE FROM batches WHERE id = ? AND user_id = ? RETURNING id",
+        (batch_id, user_id)
+    )
+    if cursor.fetchone() is None:
         raise ValueError("Batch not found or you don't have permission to delete it")
 
-    # Delete batch (CASCADE removes transactions)
-    db.execute("DELETE FROM batches WHERE id = ?", (batch_id,))
     db.commit()
 
 
@@ -228,7 +258,11 @@ def unarchive_batch(db: sqlite3.Connection, batch_id: int) -> None:
     db.commit()
 
 
-def update_batch_status_if_complete(db: sqlite3.Connection, batch_id: int) -> None:
+def update_batch_status_if_complete(
+    db: sqlite3.Connection,
+    batch_id: int,
+    commit: bool = True
+) -> None:
     """
     Check if all transactions in a batch are categorized and update status to 'complete'
 
@@ -237,6 +271,7 @@ def update_batch_status_if_complete(db: sqlite3.Connection, batch_id: int) -> No
     Args:
         db: Database connection
         batch_id: Batch ID to check
+        commit: Commit immediately (False leaves it to the caller)
     """
     # Get current batch status
     cursor = db.execute("""
@@ -253,26 +288,20 @@ def update_batch_status_if_complete(db: sqlite3.Connection, batch_id: int) -> No
     if current_status != 'in_progress':
         return
 
-    # Check if all transactions are categorized
-    cursor = db.execute("""
-        SELECT COUNT(*) as total,
-               SUM(CASE WHEN status = 'categorized' THEN 1 ELSE 0 END) as categorized
-        FROM transactions
-        WHERE batch_id = ?
-    """, (batch_id,))
+    # Check if all transactions are categorized (existence probes, no counting)
+    cursor = db.execute(SQL_BATCH_COMPLETION_PROBE, (batch_id, batch_id))
 
-    row = cursor.fetchone()
-    total = row[0]
-    categorized = row[1]
+    has_transactions, has_uncategorized = cursor.fetchone()
 
     # If all transactions are categorized, mark batch as complete
-    if total > 0 and categorized == total:
+    if has_transactions and not has_uncategorized:
         db.execute("""
             UPDATE batches
             SET status = 'complete', updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         """, (batch_id,))
-        db.commit()
+        if commit:
+            db.commit()
 
 
 def calculate_batch_date_range(
@@ -322,8 +351,15 @@ def get_batch_progress(db: sqlite3.Connection, batch_id: int) -> dict:
     """, (batch_id,))
 
     row = cursor.fetchone()
-    total = row[0] or 0
-    categorized = row[1] or 0
+    return _progress_fields(row[0], row[1])
+
+
+def _progress_fields(total: Optional[int], categorized: Optional[int]) -> dict:
+    """
+    Build the progress dict from raw transaction counts (None counts as 0)
+    """
+    total = total or 0
+    categorized = categorized or 0
 
     # Calculate percentage
     progress_percent = (categorized / total * 100) if total > 0 else 0.0
@@ -351,10 +387,7 @@ def verify_batch_ownership(
     Returns:
         True if user owns the batch, False otherwise
     """
-    cursor = db.execute(
-        "SELECT user_id FROM batches WHERE id = ?",
-        (batch_id,)
-    )
+    cursor = db.execute(SQL_GET_BATCH_OWNER, (batch_id,))
     row = cursor.fetchone()
 
     if not row:
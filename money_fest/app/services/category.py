@@ -2,11 +2,15 @@
 Category service for importing and managing categories
 """
 
+import os
 import sqlite3
-from typing import Optional
-from app.database import dict_from_row
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Union
+from app.database import dict_from_row, dicts_from_cursor
 
 
+@lru_cache(maxsize=4096)
 def parse_category_line(line: str) -> Optional[tuple[Optional[str], str, str]]:
     """
     Parse a category line from categories.txt
@@ -42,57 +46,120 @@ def parse_category_line(line: str) -> Optional[tuple[Optional[str], str, str]]:
     return (None, line, line)
 
 
-def import_categories_from_file(db: sqlite3.Connection, filepath: str) -> int:
+@lru_cache(maxsize=8)
+def _read_category_file(filepath: str, mtime_ns: int) -> tuple:
+    """
+    Read and parse a categories file (cached per path and modification time)
+
+    Returns:
+        Tuple of (parent, name, full_path) tuples in file order
+    """
+    # Read the file once, then decode as UTF-8 with latin-1 as fallback
+    data = Path(filepath).read_bytes()
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        text = data.decode('latin-1')
+
+    return parse_category_lines(text.splitlines())
+
+
+def parse_category_lines(lines: Iterable[str]) -> tuple:
+    """
+    Parse category lines, skipping empty ones and repeated categories
+
+    Args:
+        lines: Lines in categories.txt format (e.g. an open text file or io.StringIO)
+
+    Returns:
+        Tuple of (parent, name, full_path) tuples in input order; only the first
+        line for each full_path is kept (later ones would be ignored on insert anyway)
+    """
+    categories = []
+    seen = set()
+    for line in lines:
+        parsed = parse_category_line(line)
+        if parsed and parsed[2] not in seen:
+            seen.add(parsed[2])
+            categories.append(parsed)
+
+    return tuple(categories)
+
+
+def read_category_file(filepath: str) -> tuple:
+    """
+    Parse a categories file into (parent, name, full_path) tuples
+
+    The parsed result is cached until the file changes, so repeated imports
+    of the same file (e.g. setting up many databases) only read it once.
+
+    Args:
+        filepath: Path to categories file
+
+    Returns:
+        Tuple of (parent, name, full_path) tuples in file order
+    """
+    return _read_category_file(filepath, os.stat(filepath).st_mtime_ns)
+
+
+def import_categories(
+    db: sqlite3.Connection,
+    categories: Iterable[tuple[Optional[str], str, str]]
+) -> int:
+    """
+    Import already parsed categories into the database
+
+    Args:
+        db: Database connection
+        categories: (parent, name, full_path) tuples, e.g. from read_category_file
+
+    Returns:
+        Number of categories imported
+
+    Uses INSERT OR IGNORE to skip duplicates and imports all categories
+    in a single transaction.
+    """
+    # One prepared statement for all rows; rows skipped by OR IGNORE
+    # (duplicates, constraint violations) don't count towards rowcount
+    cursor = db.executemany(
+        """
+        INSERT OR IGNORE INTO categories (name, parent, full_path, usage_count)
+        VALUES (?, ?, ?, 0)
+        """,
+        ((name, parent, full_path) for parent, name, full_path in categories)
+    )
+
+    db.commit()
+    return max(cursor.rowcount, 0)
+
+
+def import_categories_from_file(
+    db: sqlite3.Connection,
+    source: Union[str, os.PathLike, Iterable[str]]
+) -> int:
     """
     Import categories from a file into the database
 
     Args:
         db: Database connection
-        filepath: Path to categories file
+        source: Path to categories file, or an iterable of text lines
+            (e.g. an open text file or io.StringIO) which is read as-is
 
     Returns:
         Number of categories imported
 
     The function:
-    - Handles both UTF-8 and latin-1 encoding
+    - Handles both UTF-8 and latin-1 encoding (when given a path)
     - Skips empty lines
     - Uses INSERT OR IGNORE to skip duplicates
     - Imports all categories in a single transaction
     """
-    # Try to read file with UTF-8 first, fallback to latin-1
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except UnicodeDecodeError:
-        with open(filepath, 'r', encoding='latin-1') as f:
-            lines = f.readlines()
-
-    # Parse all lines
-    categories = []
-    for line in lines:
-        parsed = parse_category_line(line)
-        if parsed:
-            categories.append(parsed)
-
-    # Import categories into database
-    count = 0
-    for parent, name, full_path in categories:
-        try:
-            cursor = db.execute(
-                """
-                INSERT OR IGNORE INTO categories (name, parent, full_path, usage_count)
-                VALUES (?, ?, ?, 0)
-                """,
-                (name, parent, full_path)
-            )
-            if cursor.rowcount > 0:
-                count += 1
-        except sqlite3.Error:
-            # Skip errors (e.g., constraint violations)
-            continue
+    if isinstance(source, (str, os.PathLike)):
+        categories = read_category_file(os.fspath(source))
+    else:
+        categories = parse_category_lines(source)
 
-    db.commit()
-    return count
+    return import_categories(db, categories)
 
 
 def get_all_categories(db: sqlite3.Connection) -> list[dict]:
@@ -112,8 +179,7 @@ def get_all_categories(db: sqlite3.Connection) -> list[dict]:
         ORDER BY full_path
         """
     )
-    rows = cursor.fetchall()
-    return [dict_from_row(row) for row in rows]
+    return dicts_from_cursor(cursor)
 
 
 def get_category_by_full_path(db: sqlite3.Connection, full_path: str) -> Optional[dict]:
@@ -139,19 +205,27 @@ def get_category_by_full_path(db: sqlite3.Connection, full_path: str) -> Optiona
     return dict_from_row(row) if row else None
 
 
-def increment_category_usage(db: sqlite3.Connection, full_path: str) -> None:
+def increment_category_usage(
+    db: sqlite3.Connection,
+    full_path: str,
+    delta: int = 1,
+    commit: bool = True
+) -> None:
     """
     Increment the usage count for a category
 
     Args:
         db: Database connection
         full_path: Full path of the category
+        delta: Amount to add to the usage count (default 1)
+        commit: Commit immediately (False leaves it to the caller)
     """
     db.execute(
-        "UPDATE categories SET usage_count = usage_count + 1 WHERE full_path = ?",
-        (full_path,)
+        "UPDATE categories SET usage_count = usage_count + ? WHERE full_path = ?",
+        (delta, full_path)
     )
-    db.commit()
+    if commit:
+        db.commit()
 
 
 def get_frequent_categories(db: sqlite3.Connection, limit: int = 15) -> list[dict]:
@@ -175,8 +249,7 @@ def get_frequent_categories(db: sqlite3.Connection, limit: int = 15) -> list[dic
         """,
         (limit,)
     )
-    rows = cursor.fetchall()
-    return [dict_from_row(row) for row in rows]
+    return dicts_from_cursor(cursor)
 
 
 def create_category(db: sqlite3.Connection, full_path: str) -> dict:
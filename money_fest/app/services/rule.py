@@ -3,8 +3,12 @@ Rule management service functions (Phase 5)
 """
 
 import sqlite3
-from typing import List, Optional
-from app.database import dict_from_row
+from typing import List, Optional, Tuple
+from app.database import dict_from_row, dicts_from_cursor
+
+
+# Allowed values of rules.match_type (mirrors the CHECK constraint)
+MATCH_TYPES = ('contains', 'exact')
 
 
 def create_rule(
@@ -59,6 +63,62 @@ def create_rule(
     return dict_from_row(row)
 
 
+def create_rules_bulk(
+    db: sqlite3.Connection,
+    user_id: int,
+    rules: List[Tuple[str, str, str]]
+) -> int:
+    """
+    Create many rules at once
+
+    All rules are validated before anything is inserted, and the inserts run
+    as one executemany. Like create_rule, the commit is left to the caller.
+
+    Args:
+        db: Database connection
+        user_id: ID of the user creating the rules
+        rules: List of (pattern, match_type, category) tuples
+
+    Returns:
+        Number of rules created
+
+    Raises:
+        ValueError: If any match_type is invalid or any category doesn't exist
+            (no rules are created)
+    """
+    if not rules:
+        return 0
+
+    # Validate match types
+    for _, match_type, _ in rules:
+        if match_type not in MATCH_TYPES:
+            raise ValueError(f"Invalid match_type '{match_type}'")
+
+    # Validate all categories with one query
+    categories = sorted({category for _, _, category in rules})
+    placeholders = ', '.join('?' * len(categories))
+    existing = {
+        row[0] for row in db.execute(
+            f"SELECT full_path FROM categories WHERE full_path IN ({placeholders})",
+            categories
+        )
+    }
+    missing = [category for category in categories if category not in existing]
+    if missing:
+        raise ValueError(f"Category '{missing[0]}' does not exist")
+
+    # Insert all rules with one prepared statement
+    cursor = db.executemany(
+        """
+        INSERT INTO rules (user_id, pattern, match_type, category)
+        VALUES (?, ?, ?, ?)
+        """,
+        [(user_id, pattern, match_type, category) for pattern, match_type, category in rules]
+    )
+
+    return cursor.rowcount
+
+
 def list_rules(db: sqlite3.Connection, user_id: int) -> List[dict]:
     """
     List all rules for a user
@@ -79,7 +139,28 @@ def list_rules(db: sqlite3.Connection, user_id: int) -> List[dict]:
         (user_id,)
     )
 
-    return [dict_from_row(row) for row in cursor.fetchall()]
+    return dicts_from_cursor(cursor)
+
+
+def _list_rule_tuples(db: sqlite3.Connection, user_id: int) -> List[tuple]:
+    """
+    List only the columns needed for matching, as plain tuples
+
+    Internal fast path for get_matching_rules_for_transaction.
+
+    Returns:
+        List of (id, pattern, match_type, category) tuples, newest first
+    """
+    cursor = db.execute(
+        """
+        SELECT id, pattern, match_type, category FROM rules
+        WHERE user_id = ?
+        ORDER BY created_at DESC
+        """,
+        (user_id,)
+    )
+
+    return cursor.fetchall()
 
 
 def get_rule(db: sqlite3.Connection, rule_id: int, user_id: int) -> Optional[dict]:
@@ -214,27 +295,23 @@ def get_matching_rules_for_transaction(
     Returns:
         List of matching rules with suggestions
     """
-    # Get all rules for user
-    rules = list_rules(db, user_id)
+    payee_lower = payee.lower()
 
     matching_rules = []
-    for rule in rules:
-        pattern = rule['pattern']
-        match_type = rule['match_type']
-
+    for rule_id, pattern, match_type, category in _list_rule_tuples(db, user_id):
         # Check if rule matches
         matches = False
         if match_type == 'contains':
-            matches = pattern.lower() in payee.lower()
+            matches = pattern.lower() in payee_lower
         elif match_type == 'exact':
-            matches = pattern.lower() == payee.lower()
+            matches = pattern.lower() == payee_lower
 
         if matches:
             matching_rules.append({
-                'rule_id': rule['id'],
-                'category': rule['category'],
-                'pattern': rule['pattern'],
-                'match_type': rule['match_type']
+                'rule_id': rule_id,
+                'category': category,
+                'pattern': pattern,
+                'match_type': match_type
             })
 
     return matching_rules
@@ -272,7 +349,9 @@ def get_matching_transactions_for_rule(
         payee_param = escaped
 
     query = f"""
-        SELECT t.*, b.name AS batch_name FROM transactions t
+        SELECT t.id, t.batch_id, t.date, t.payee, t.amount, t.category, t.note,
+               t.status, t.created_at, t.updated_at, b.name AS batch_name
+        FROM transactions t
         JOIN batches b ON t.batch_id = b.id
         WHERE b.user_id = ? AND {payee_condition}
     """
@@ -286,4 +365,4 @@ def get_matching_transactions_for_rule(
     params.append(limit)
 
     cursor = db.execute(query, params)
-    return [dict_from_row(row) for row in cursor.fetchall()]
+    return dicts_from_cursor(cursor)
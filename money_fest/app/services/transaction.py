@@ -2,12 +2,123 @@
 Transaction service layer - Business logic for transaction management
 """
 
+import json
 import sqlite3
-from typing import List, Optional
-from app.services.batch import verify_batch_ownership
+from typing import Iterator, List, NamedTuple, Optional
+from app.database import dict_from_row, dicts_from_cursor
+from app.services.batch import verify_batch_ownership, update_batch_status_if_complete
 from app.services.category import increment_category_usage as increment_cat_usage
 
 
+class Transaction(NamedTuple):
+    """
+    Read-only transaction record (fields in the column order of the SELECTs below)
+
+    Used for internal one-pass processing such as CSV export, where a fixed
+    tuple is much cheaper than a dict per row. API responses keep using dicts.
+    """
+    id: int
+    batch_id: int
+    date: str
+    payee: str
+    amount: float
+    category: Optional[str]
+    note: Optional[str]
+    status: str
+    created_at: str
+    updated_at: str
+
+
+# SQL used on the hot paths, kept as module constants so every call passes the
+# identical string and hits the connection's prepared-statement cache
+SQL_LIST_TRANSACTIONS = """
+    SELECT id, batch_id, date, payee, amount, category, note, status,
+           created_at, updated_at
+    FROM transactions
+    WHERE batch_id = ?
+    ORDER BY date ASC, id ASC
+"""
+
+# Listings for a user: the ownership check is part of the query (JOIN on batches)
+SQL_LIST_OWNED_TRANSACTIONS = """
+    SELECT t.id, t.batch_id, t.date, t.payee, t.amount, t.category, t.note, t.status,
+           t.created_at, t.updated_at
+    FROM transactions t
+    JOIN batches b ON b.id = t.batch_id
+    WHERE t.batch_id = ? AND b.user_id = ?
+    ORDER BY t.date ASC, t.id ASC
+"""
+
+SQL_LIST_OWNED_TRANSACTIONS_BY_STATUS = """
+    SELECT t.id, t.batch_id, t.date, t.payee, t.amount, t.category, t.note, t.status,
+           t.created_at, t.updated_at
+    FROM transactions t
+    JOIN batches b ON b.id = t.batch_id
+    WHERE t.batch_id = ? AND b.user_id = ? AND t.status = ?
+    ORDER BY t.date ASC, t.id ASC
+"""
+
+SQL_GET_TRANSACTION = """
+    SELECT id, batch_id, date, payee, amount, category, note, status,
+           created_at, updated_at
+    FROM transactions
+    WHERE id = ?
+"""
+
+SQL_GET_TRANSACTION_BATCH_ID = "SELECT batch_id FROM transactions WHERE id = ?"
+
+SQL_UPDATE_TRANSACTION = """
+    UPDATE transactions
+    SET category = ?, note = ?, status = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+SQL_CATEGORY_EXISTS = "SELECT 1 FROM categories WHERE full_path = ? LIMIT 1"
+
+# IDs are bound as one JSON array, so the SQL text is the same for any number of
+# IDs (stays in the statement cache, no bound-parameter limit)
+SQL_BATCH_IDS_FOR_TRANSACTIONS = """
+    SELECT DISTINCT batch_id FROM transactions
+    WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+
+def _query_transactions(
+    db: sqlite3.Connection,
+    batch_id: int,
+    user_id: int,
+    status: Optional[str] = None
+) -> List[dict]:
+    """
+    Shared implementation of the transaction listing functions
+
+    Args:
+        db: Database connection
+        batch_id: Batch ID
+        user_id: User ID (for ownership verification)
+        status: Only return transactions with this status (None = all)
+
+    Returns:
+        List of transaction dicts sorted by date
+
+    Raises:
+        ValueError: If batch not found or not owned by user
+    """
+    # Get transactions (only rows of a batch owned by the user are returned)
+    if status is None:
+        cursor = db.execute(SQL_LIST_OWNED_TRANSACTIONS, (batch_id, user_id))
+    else:
+        cursor = db.execute(SQL_LIST_OWNED_TRANSACTIONS_BY_STATUS, (batch_id, user_id, status))
+
+    transactions = dicts_from_cursor(cursor)
+
+    # An empty result may mean the batch isn't the user's: only then check ownership
+    if not transactions and not verify_batch_ownership(db, batch_id, user_id):
+        raise ValueError("Batch not found or you don't have permission to view it")
+
+    return transactions
+
+
 def list_transactions(
     db: sqlite3.Connection,
     batch_id: int,
@@ -27,38 +138,50 @@ def list_transactions(
     Raises:
         ValueError: If batch not found or not owned by user
     """
+    return _query_transactions(db, batch_id, user_id)
+
+
+def iter_transactions(
+    db: sqlite3.Connection,
+    batch_id: int,
+    user_id: int,
+    chunk_size: int = 500
+) -> Iterator[Transaction]:
+    """
+    Stream all transactions for a batch without materializing the full list
+
+    Rows are fetched from SQLite chunk_size at a time, which keeps memory flat
+    for consumers that only need one pass (e.g. CSV export).
+    Each row becomes a Transaction record (use ._asdict() if a dict is needed).
+
+    Args:
+        db: Database connection
+        batch_id: Batch ID
+        user_id: User ID (for ownership verification)
+        chunk_size: Number of rows fetched per round
+
+    Returns:
+        Iterator of Transaction records sorted by date
+
+    Raises:
+        ValueError: If batch not found or not owned by user (raised immediately,
+            not on first iteration)
+    """
     # Verify ownership
     if not verify_batch_ownership(db, batch_id, user_id):
         raise ValueError("Batch not found or you don't have permission to view it")
 
-    # Get transactions
-    cursor = db.execute("""
-        SELECT id, batch_id, date, payee, amount, category, note, status,
-               created_at, updated_at
-        FROM transactions
-        WHERE batch_id = ?
-        ORDER BY date ASC, id ASC
-    """, (batch_id,))
-
-    rows = cursor.fetchall()
-
-    # Convert to dicts
-    transactions = []
-    for row in rows:
-        transactions.append({
-            'id': row[0],
-            'batch_id': row[1],
-            'date': row[2],
-            'payee': row[3],
-            'amount': row[4],
-            'category': row[5],
-            'note': row[6],
-            'status': row[7],
-            'created_at': row[8],
-            'updated_at': row[9]
-        })
+    cursor = db.execute(SQL_LIST_TRANSACTIONS, (batch_id,))
 
-    return transactions
+    def generate() -> Iterator[Transaction]:
+        make = Transaction._make
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from map(make, rows)
+
+    return generate()
 
 
 def get_transaction_by_id(
@@ -75,29 +198,27 @@ def get_transaction_by_id(
     Returns:
         Transaction dict or None if not found
     """
-    cursor = db.execute("""
-        SELECT id, batch_id, date, payee, amount, category, note, status,
-               created_at, updated_at
-        FROM transactions
-        WHERE id = ?
-    """, (transaction_id,))
+    cursor = db.execute(SQL_GET_TRANSACTION, (transaction_id,))
 
     row = cursor.fetchone()
     if not row:
         return None
 
-    return {
-        'id': row[0],
-        'batch_id': row[1],
-        'date': row[2],
-        'payee': row[3],
-        'amount': row[4],
-        'category': row[5],
-        'note': row[6],
-        'status': row[7],
-        'created_at': row[8],
-        'updated_at': row[9]
-    }
+    return dict_from_row(row)
+
+
+def _get_transaction_batch_id(
+    db: sqlite3.Connection,
+    transaction_id: int
+) -> Optional[int]:
+    """
+    Get only the batch ID of a transaction (existence check without building a dict)
+
+    Returns:
+        Batch ID or None if the transaction doesn't exist
+    """
+    row = db.execute(SQL_GET_TRANSACTION_BATCH_ID, (transaction_id,)).fetchone()
+    return row[0] if row else None
 
 
 def update_transaction(
@@ -121,9 +242,9 @@ def update_transaction(
     Raises:
         ValueError: If transaction not found or category doesn't exist
     """
-    # Get current transaction
-    transaction = get_transaction_by_id(db, transaction_id)
-    if not transaction:
+    # Check the transaction exists (only its batch is needed before updating)
+    batch_id = _get_transaction_batch_id(db, transaction_id)
+    if batch_id is None:
         raise ValueError(f"Transaction {transaction_id} not found")
 
     # Validate category exists (if provided and not empty)
@@ -138,21 +259,17 @@ def update_transaction(
         new_status = 'uncategorized'
 
     # Update transaction
-    db.execute("""
-        UPDATE transactions
-        SET category = ?, note = ?, status = ?, updated_at = CURRENT_TIMESTAMP
-        WHERE id = ?
-    """, (category, note, new_status, transaction_id))
+    db.execute(SQL_UPDATE_TRANSACTION, (category, note, new_status, transaction_id))
 
     # Increment category usage count (if category was set)
     if category:
-        increment_cat_usage(db, category)
-
-    db.commit()
+        increment_cat_usage(db, category, commit=False)
 
     # Check if batch is now complete
-    from app.services.batch import update_batch_status_if_complete
-    update_batch_status_if_complete(db, transaction['batch_id'])
+    update_batch_status_if_complete(db, batch_id, commit=False)
+
+    # Commit all changes at once
+    db.commit()
 
     # Return updated transaction
     return get_transaction_by_id(db, transaction_id)
@@ -187,15 +304,34 @@ def bulk_update_transactions(
         if not category_exists(db, category):
             raise ValueError(f"Category '{category}' does not exist")
 
-    # Update each transaction (update_transaction handles batch status check)
-    updated_count = 0
-    for txn_id in transaction_ids:
-        try:
-            update_transaction(db, txn_id, category, note)
-            updated_count += 1
-        except ValueError:
-            # Skip transactions that don't exist
-            continue
+    # Collect affected batches before updating (missing IDs are simply skipped).
+    # Only needed when setting a category: clearing one can never complete a batch.
+    batches_touched = set()
+    if category:
+        cursor = db.execute(SQL_BATCH_IDS_FOR_TRANSACTIONS, (json.dumps(transaction_ids),))
+        batches_touched = {row[0] for row in cursor}
+
+    # Determine new status
+    new_status = 'categorized' if category else 'uncategorized'
+
+    # Update all transactions by running the single-row UPDATE through executemany:
+    # one prepared statement, no per-row Python dispatch, and no limit on the
+    # number of IDs (rowcount is summed over all executions)
+    cursor = db.executemany(
+        SQL_UPDATE_TRANSACTION,
+        [(category, note, new_status, txn_id) for txn_id in transaction_ids]
+    )
+    updated_count = cursor.rowcount
+
+    # Increment category usage count once for all updated transactions
+    if category and updated_count:
+        increment_cat_usage(db, category, delta=updated_count, commit=False)
+
+    # Check once per affected batch if it is now complete
+    for batch_id in batches_touched:
+        update_batch_status_if_complete(db, batch_id, commit=False)
+
+    db.commit()
 
     return updated_count
 
@@ -211,12 +347,8 @@ def category_exists(db: sqlite3.Connection, category: str) -> bool:
     Returns:
         True if category exists, False otherwise
     """
-    cursor = db.execute(
-        "SELECT COUNT(*) FROM categories WHERE full_path = ?",
-        (category,)
-    )
-    row = cursor.fetchone()
-    return row[0] > 0
+    cursor = db.execute(SQL_CATEGORY_EXISTS, (category,))
+    return cursor.fetchone() is not None
 
 
 def clear_transaction_category(
@@ -258,38 +390,7 @@ def get_uncategorized_transactions(
     Raises:
         ValueError: If batch not found or not owned by user
     """
-    # Verify ownership
-    if not verify_batch_ownership(db, batch_id, user_id):
-        raise ValueError("Batch not found or you don't have permission to view it")
-
-    # Get uncategorized transactions
-    cursor = db.execute("""
-        SELECT id, batch_id, date, payee, amount, category, note, status,
-               created_at, updated_at
-        FROM transactions
-        WHERE batch_id = ? AND status = 'uncategorized'
-        ORDER BY date ASC, id ASC
-    """, (batch_id,))
-
-    rows = cursor.fetchall()
-
-    # Convert to dicts
-    transactions = []
-    for row in rows:
-        transactions.append({
-            'id': row[0],
-            'batch_id': row[1],
-            'date': row[2],
-            'payee': row[3],
-            'amount': row[4],
-            'category': row[5],
-            'note': row[6],
-            'status': row[7],
-            'created_at': row[8],
-            'updated_at': row[9]
-        })
-
-    return transactions
+    return _query_transactions(db, batch_id, user_id, status='uncategorized')
 
 
 def get_categorized_transactions(
@@ -311,35 +412,4 @@ def get_categorized_transactions(
     Raises:
         ValueError: If batch not found or not owned by user
     """
-    # Verify ownership
-    if not verify_batch_ownership(db, batch_id, user_id):
-        raise ValueError("Batch not found or you don't have permission to view it")
-
-    # Get categorized transactions
-    cursor = db.execute("""
-        SELECT id, batch_id, date, payee, amount, category, note, status,
-               created_at, updated_at
-        FROM transactions
-        WHERE batch_id = ? AND status = 'categorized'
-        ORDER BY date ASC, id ASC
-    """, (batch_id,))
-
-    rows = cursor.fetchall()
-
-    # Convert to dicts
-    transactions = []
-    for row in rows:
-        transactions.append({
-            'id': row[0],
-            'batch_id': row[1],
-            'date': row[2],
-            'payee': row[3],
-            'amount': row[4],
-            'category': row[5],
-            'note': row[6],
-            'status': row[7],
-            'created_at': row[8],
-            'updated_at': row[9]
-        })
-
-    return transactions
+    return _query_transactions(db, batch_id, user_id, status='categorized')
@@ -5,7 +5,7 @@ User service for user management and authentication
 import bcrypt
 import sqlite3
 from typing import Optional
-from app.database import dict_from_row
+from app.database import dict_from_row, dicts_from_cursor
 
 
 def validate_password(password: str) -> None:
@@ -136,8 +136,7 @@ def get_all_users(db: sqlite3.Connection) -> list[dict]:
     cursor = db.execute(
         "SELECT id, username, password_hash, created_at FROM users ORDER BY created_at"
     )
-    rows = cursor.fetchall()
-    return [dict_from_row(row) for row in rows]
+    return dicts_from_cursor(cursor)
 
 
 def authenticate_user(db: sqlite3.Connection, username: str, password: str) -> Optional[dict]:
@@ -15,56 +15,61 @@ import os
 # Add parent directory to path to import app modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from app.database import get_database_path
+from app.config import settings
 
 
 def fix_batch_statuses():
     """Fix batch statuses for all existing batches"""
-    db_path = get_database_path()
+    db_path = settings.DATABASE_PATH
 
     print(f"Connecting to database: {db_path}")
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
-    # Find all in_progress batches
+    # Find all in_progress batches with their progress in one query (for reporting)
     cursor.execute("""
-        SELECT id, name FROM batches WHERE status = 'in_progress'
+        SELECT b.id, b.name,
+               COUNT(t.id) as total,
+               SUM(CASE WHEN t.status = 'categorized' THEN 1 ELSE 0 END) as categorized
+        FROM batches b
+        LEFT JOIN transactions t ON t.batch_id = b.id
+        WHERE b.status = 'in_progress'
+        GROUP BY b.id
     """)
     in_progress_batches = cursor.fetchall()
 
     print(f"Found {len(in_progress_batches)} in_progress batches")
 
-    updated_count = 0
-
-    for batch_id, batch_name in in_progress_batches:
-        # Check if all transactions are categorized
-        cursor.execute("""
-            SELECT COUNT(*) as total,
-                   SUM(CASE WHEN status = 'categorized' THEN 1 ELSE 0 END) as categorized
-            FROM transactions
-            WHERE batch_id = ?
-        """, (batch_id,))
-
-        row = cursor.fetchone()
-        total = row[0]
-        categorized = row[1] or 0
-
+    # Decide once which batches are complete (all transactions categorized;
+    # batches without transactions stay in progress)
+    complete = []
+    report = []
+    for batch_id, batch_name, total, categorized in in_progress_batches:
+        categorized = categorized or 0
         if total > 0 and categorized == total:
-            # All transactions categorized, mark as complete
-            cursor.execute("""
-                UPDATE batches
-                SET status = 'complete', updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (batch_id,))
-
-            print(f"  ✓ Updated batch '{batch_name}' (ID: {batch_id}) to 'complete'")
-            updated_count += 1
+            complete.append(batch_id)
+            report.append(f"  ✓ Updated batch '{batch_name}' (ID: {batch_id}) to 'complete'")
         else:
-            print(f"  - Batch '{batch_name}' (ID: {batch_id}) still has {total - categorized}/{total} uncategorized transactions")
+            report.append(f"  - Batch '{batch_name}' (ID: {batch_id}) still has {total - categorized}/{total} uncategorized transactions")
+
+    # Mark exactly those batches as complete with a single statement
+    updated_count = 0
+    if complete:
+        placeholders = ', '.join('?' * len(complete))
+        cursor.execute(f"""
+            UPDATE batches
+            SET status = 'complete', updated_at = CURRENT_TIMESTAMP
+            WHERE id IN ({placeholders})
+        """, complete)
+        updated_count = cursor.rowcount
 
     conn.commit()
     conn.close()
 
+    # Report only after the update has been committed
+    if report:
+        print('\n'.join(report))
+
     print(f"\nMigration complete: {updated_count} batches updated to 'complete'")
 
 
@@ -0,0 +1,74 @@
+"""
+Shared fixtures for the Python test suite
+"""
+
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import get_current_user
+from app.database import create_schema, get_db
+from app.main import app
+from app.services.batch import create_batch
+from app.services.category import import_categories
+
+
+# Small category set used by the service tests
+TEST_CATEGORIES = [
+    (None, 'Food', 'Food'),
+    ('Food', 'Groceries', 'Food:Groceries'),
+    ('Food', 'Dining out', 'Food:Dining out'),
+    (None, 'Transportation', 'Transportation'),
+]
+
+
+@pytest.fixture
+def db():
+    """Fresh in-memory database with the full schema"""
+    # Not bound to one thread: TestClient runs sync endpoints in a worker thread
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    create_schema(conn)
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def user_id(db):
+    """ID of a test user (inserted directly, no password hashing needed)"""
+    cursor = db.execute(
+        "INSERT INTO users (username, password_hash) VALUES (?, ?)",
+        ('test', 'not-a-real-hash')
+    )
+    return cursor.lastrowid
+
+
+@pytest.fixture
+def categories(db):
+    """Import the test categories"""
+    import_categories(db, TEST_CATEGORIES)
+    return [full_path for _, _, full_path in TEST_CATEGORIES]
+
+
+@pytest.fixture
+def batch_id(db, user_id):
+    """ID of a batch with three uncategorized transactions"""
+    return create_batch(db, "Test Batch", user_id, [
+        {'date': '2023-07-21', 'payee': 'DSB', 'amount': -160.0},
+        {'date': '2023-07-22', 'payee': 'Netto', 'amount': -146.45},
+        {'date': '2023-07-27', 'payee': 'Salary', 'amount': 28511.61},
+    ])
+
+
+@pytest.fixture
+def client(db, user_id):
+    """API client using the test database, logged in as the test user"""
+    def override_get_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: {'id': user_id, 'username': 'test'}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
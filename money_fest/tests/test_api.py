@@ -0,0 +1,36 @@
+"""
+Tests for the API endpoints
+"""
+
+from app.services.transaction import bulk_update_transactions, list_transactions
+
+
+def test_download_batch_csv(client, db, user_id, categories, batch_id):
+    """The download is the batch as AceMoney CSV, and a complete batch gets archived"""
+    ids = [txn['id'] for txn in list_transactions(db, batch_id, user_id)]
+    bulk_update_transactions(db, ids, category='Food:Groceries', note='ok')
+
+    response = client.get(f"/batches/{batch_id}/download")
+
+    assert response.status_code == 200
+    assert response.headers['content-disposition'] == 'attachment; filename="Test_Batch.csv"'
+    assert response.content.decode('latin-1').splitlines() == [
+        'transaction,date,payee,category,status,withdrawal,deposit,total,comment',
+        ',21.07.2023,DSB,Food:Groceries,,160.00,,,ok',
+        ',22.07.2023,Netto,Food:Groceries,,146.45,,,ok',
+        ',27.07.2023,Salary,Food:Groceries,,,28511.61,,ok',
+    ]
+    status = db.execute("SELECT status FROM batches WHERE id = ?", (batch_id,)).fetchone()[0]
+    assert status == 'archived'
+
+
+def test_download_other_users_batch(client, db, batch_id):
+    """Another user's batch is reported as not found"""
+    other_user_id = db.execute(
+        "INSERT INTO users (username, password_hash) VALUES ('other', 'x')"
+    ).lastrowid
+    db.execute("UPDATE batches SET user_id = ? WHERE id = ?", (other_user_id, batch_id))
+
+    response = client.get(f"/batches/{batch_id}/download")
+
+    assert response.status_code == 404
@@ -0,0 +1,103 @@
+"""
+Tests for the batch service
+"""
+
+import pytest
+
+from app.services.batch import archive_batch, delete_batch, get_batch_by_id, list_batches
+from app.services.transaction import bulk_update_transactions, list_transactions
+
+
+def insert_batch(db, user_id, name, created_at='2024-01-01 10:00:00', status='in_progress'):
+    """Insert a batch row directly (create_batch requires transactions)"""
+    return db.execute(
+        "INSERT INTO batches (name, user_id, status, created_at) VALUES (?, ?, ?, ?)",
+        (name, user_id, status, created_at)
+    ).lastrowid
+
+
+# ==================== Progress ====================
+
+def test_batch_without_transactions_has_zero_progress(db, user_id):
+    """An empty batch counts 0 of 0 (LEFT JOIN keeps it, progress is 0.0)"""
+    batch_id = insert_batch(db, user_id, "Empty")
+
+    for batch in (get_batch_by_id(db, batch_id), list_batches(db, user_id)[0]):
+        assert (batch['total_count'], batch['categorized_count'], batch['progress_percent']) == (0, 0, 0.0)
+
+
+def test_partly_categorized_batch_progress(db, user_id, categories, batch_id):
+    """Progress counts categorized transactions out of all of them"""
+    first_id = list_transactions(db, batch_id, user_id)[0]['id']
+    bulk_update_transactions(db, [first_id], category='Food')
+
+    for batch in (get_batch_by_id(db, batch_id), list_batches(db, user_id)[0]):
+        assert (batch['total_count'], batch['categorized_count'], batch['progress_percent']) == (3, 1, 33.3)
+        assert batch['name'] == 'Test Batch' and batch['status'] == 'in_progress'
+
+
+def test_get_batch_not_found(db):
+    """A missing batch is None"""
+    assert get_batch_by_id(db, 999999) is None
+
+
+# ==================== Listing ====================
+
+def test_list_batches_include_archived(db, user_id):
+    """Archived batches are only listed with include_archived"""
+    active_id = insert_batch(db, user_id, "Active")
+    archived_id = insert_batch(db, user_id, "Archived")
+    archive_batch(db, archived_id)
+
+    assert [b['id'] for b in list_batches(db, user_id)] == [active_id]
+    assert {b['id'] for b in list_batches(db, user_id, include_archived=True)} == {active_id, archived_id}
+
+
+def test_list_batches_only_own(db, user_id):
+    """Other users' batches are not listed"""
+    other_user_id = db.execute(
+        "INSERT INTO users (username, password_hash) VALUES ('other', 'x')"
+    ).lastrowid
+    insert_batch(db, other_user_id, "Theirs")
+
+    assert list_batches(db, user_id, include_archived=True) == []
+
+
+def test_list_batches_order(db, user_id):
+    """Newest first by created_at; batches created at the same time newest id first"""
+    old_id = insert_batch(db, user_id, "Old", created_at='2024-01-01 09:00:00')
+    tie_first_id = insert_batch(db, user_id, "Tie 1", created_at='2024-01-02 09:00:00')
+    tie_second_id = insert_batch(db, user_id, "Tie 2", created_at='2024-01-02 09:00:00')
+    new_id = insert_batch(db, user_id, "New", created_at='2024-01-03 09:00:00')
+
+    expected = [new_id, tie_second_id, tie_first_id, old_id]
+    assert [b['id'] for b in list_batches(db, user_id)] == expected
+    assert [b['id'] for b in list_batches(db, user_id, include_archived=True)] == expected
+
+
+# ==================== Delete ====================
+
+def test_delete_batch_cascades(db, user_id, batch_id):
+    """Deleting a batch removes all its transactions"""
+    delete_batch(db, batch_id, user_id)
+
+    assert get_batch_by_id(db, batch_id) is None
+    assert db.execute("SELECT COUNT(*) FROM transactions WHERE batch_id = ?", (batch_id,)).fetchone()[0] == 0
+
+
+def test_delete_batch_not_owner(db, user_id, batch_id):
+    """Another user's batch is not deleted"""
+    other_user_id = db.execute(
+        "INSERT INTO users (username, password_hash) VALUES ('other', 'x')"
+    ).lastrowid
+
+    with pytest.raises(ValueError, match="Batch not found or you don't have permission to delete it"):
+        delete_batch(db, batch_id, other_user_id)
+
+    assert get_batch_by_id(db, batch_id) is not None
+
+
+def test_delete_batch_not_found(db, user_id):
+    """Deleting a missing batch raises ValueError"""
+    with pytest.raises(ValueError, match="Batch not found"):
+        delete_batch(db, 999999, user_id)
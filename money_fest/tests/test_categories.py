@@ -0,0 +1,82 @@
+"""
+Tests for category parsing and import
+"""
+
+import io
+import os
+
+from app.services.category import (
+    get_all_categories,
+    import_categories_from_file,
+    parse_category_line,
+    parse_category_lines,
+    read_category_file,
+)
+
+
+def test_parse_category_line():
+    """Parent-only and parent:child lines, blank lines are skipped"""
+    assert parse_category_line("Clothing") == (None, "Clothing", "Clothing")
+    assert parse_category_line(" Automobile : Gasoline \n") == ("Automobile", "Gasoline", "Automobile:Gasoline")
+    assert parse_category_line("   ") is None
+
+
+def test_parse_category_lines_drops_duplicates():
+    """Only the first line for each full_path is kept, in input order"""
+    assert parse_category_lines(["Food", "Food:Groceries", "", "Food", "Food : Groceries", "Travel"]) == (
+        (None, "Food", "Food"),
+        ("Food", "Groceries", "Food:Groceries"),
+        (None, "Travel", "Travel"),
+    )
+
+
+def test_import_from_stringio(db):
+    """An iterable of lines is imported as-is"""
+    count = import_categories_from_file(db, io.StringIO("Food\nFood:Groceries\n\nFood\n"))
+
+    assert count == 2
+    assert sorted(c['full_path'] for c in get_all_categories(db)) == ["Food", "Food:Groceries"]
+
+
+def test_reimport_counts_only_new_categories(db, tmp_path):
+    """Importing the same file again adds nothing and reports 0"""
+    path = tmp_path / "categories.txt"
+    path.write_text("Food\nFood:Groceries\n", encoding='utf-8')
+
+    assert import_categories_from_file(db, path) == 2
+    assert import_categories_from_file(db, path) == 0
+    assert import_categories_from_file(db, io.StringIO("Food\nTravel\n")) == 1
+
+
+def test_read_latin1_file(tmp_path):
+    """Files that are not valid UTF-8 are read as latin-1"""
+    path = tmp_path / "categories.txt"
+    path.write_bytes("Bolig:Husleje\nFørste:Ærter\n".encode('latin-1'))
+
+    assert read_category_file(str(path)) == (
+        ("Bolig", "Husleje", "Bolig:Husleje"),
+        ("Første", "Ærter", "Første:Ærter"),
+    )
+
+
+def test_read_utf8_file(tmp_path):
+    """UTF-8 files are decoded as UTF-8"""
+    path = tmp_path / "categories.txt"
+    path.write_text("Første:Ærter\n", encoding='utf-8')
+
+    assert read_category_file(str(path)) == (("Første", "Ærter", "Første:Ærter"),)
+
+
+def test_read_cache_invalidated_when_file_changes(tmp_path):
+    """The cached parse is reused until the file's modification time changes"""
+    path = tmp_path / "categories.txt"
+    path.write_text("Food\n", encoding='utf-8')
+    first = read_category_file(str(path))
+    assert read_category_file(str(path)) is first
+
+    path.write_text("Food\nTravel\n", encoding='utf-8')
+    # Make sure the mtime differs even on filesystems with coarse timestamps
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert read_category_file(str(path)) == ((None, "Food", "Food"), (None, "Travel", "Travel"))
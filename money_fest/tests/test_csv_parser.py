@@ -0,0 +1,307 @@
+"""
+Tests for CSV parsing and generation
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.services.csv_parser import (
+    AceMoneyParser,
+    CSVGenerator,
+    DanskeBankParser,
+    MAX_CACHED_HEADER_LENGTH,
+    ParsedTransaction,
+    _ACEMONEY_HEADER_RE,
+    _DANSKE_BANK_HEADER_RE,
+    _detect_header_format,
+    detect_csv_format,
+    get_parser,
+)
+from app.services.transaction import Transaction
+
+
+ACEMONEY_HEADER = "transaction,date,payee,category,status,withdrawal,deposit,total,comment\r\n"
+DANSKE_BANK_HEADER = '"Dato";"Tekst";"Beløb";"Saldo";"Status";"Afstemt"\r\n'
+
+
+def acemoney_csv(*rows: str) -> bytes:
+    """Build an AceMoney file (latin-1) from data rows"""
+    return (ACEMONEY_HEADER + ''.join(row + '\r\n' for row in rows)).encode('latin-1')
+
+
+# ==================== Format detection ====================
+
+def test_detect_acemoney():
+    """The exact AceMoney header is detected, with or without CR line endings"""
+    assert detect_csv_format(acemoney_csv(",21.07.2023,DSB,,,160.0,,,")) == "acemoney"
+    assert detect_csv_format(b"transaction,date,payee,category,status,withdrawal,deposit,total,comment\r\r\n") == "acemoney"
+
+
+def test_detect_acemoney_aliases():
+    """'Num' and 'S' header aliases (as exported with quotes) are accepted"""
+    content = b'"Num","Date","Payee","Category","S","Withdrawal","Deposit","Total","Comment"\n'
+
+    assert detect_csv_format(content) == "acemoney"
+    assert isinstance(get_parser(content), AceMoneyParser)
+
+
+@pytest.mark.parametrize("header", [
+    DANSKE_BANK_HEADER.encode('utf-8'),
+    DANSKE_BANK_HEADER.encode('iso-8859-1'),
+    b'"Dato";"Tekst";"Bel?b";"Saldo";"Status";"Afstemt"\n',
+    b'"Dato";"Tekst";"Bel\xef\xbf\xbdb";"Saldo";"Status";"Afstemt"\n',
+    b'Dato;Tekst;Saldo;Status\n',
+])
+def test_detect_danske_bank(header):
+    """Danske Bank is detected in UTF-8, ISO-8859-1, with a damaged 'Beløb' or only the required headers"""
+    assert detect_csv_format(header + b'"21.07.2023";"Netto";"-1,00";"0,00";"";""\n') == "danske_bank"
+
+
+def test_header_regexes_match_unmodified_exports():
+    """The byte-level fast path covers exact exports, including a damaged 'Beløb'"""
+    assert _DANSKE_BANK_HEADER_RE.match(DANSKE_BANK_HEADER.encode('iso-8859-1').rstrip(b'\n'))
+    assert _DANSKE_BANK_HEADER_RE.match(b'"Dato";"Tekst";"Bel?b";"Saldo";"Status";"Afstemt"')
+    assert _ACEMONEY_HEADER_RE.match(ACEMONEY_HEADER.upper().encode('latin-1').rstrip(b'\n'))
+    assert not _DANSKE_BANK_HEADER_RE.match(b'"Dato";"Tekst";"Saldo";"Status"')
+    assert not _ACEMONEY_HEADER_RE.match(b'num,date,payee,category,s,withdrawal,deposit,total,comment')
+
+
+def test_detect_unknown_format():
+    """Unrecognized headers raise ValueError"""
+    with pytest.raises(ValueError, match="Could not detect CSV format"):
+        detect_csv_format(b"a,b,c\n1,2,3\n")
+
+
+def test_detect_caches_per_header():
+    """Repeated detection of the same header line is answered from the cache"""
+    content = acemoney_csv(",21.07.2023,DSB,,,160.0,,,")
+    detect_csv_format(content)
+    hits = _detect_header_format.cache_info().hits
+
+    assert detect_csv_format(content + b",22.07.2023,Other,,,1.0,,,\r\n") == "acemoney"
+    assert _detect_header_format.cache_info().hits == hits + 1
+
+
+def test_detect_oversized_header_bypasses_cache():
+    """Header lines longer than MAX_CACHED_HEADER_LENGTH are checked without caching"""
+    header = b'"Dato";"Tekst";"Saldo";"Status";"' + b'x' * MAX_CACHED_HEADER_LENGTH + b'"\n'
+    info = _detect_header_format.cache_info()
+
+    assert detect_csv_format(header) == "danske_bank"
+    with pytest.raises(ValueError, match="Could not detect CSV format"):
+        detect_csv_format(b'a,' * MAX_CACHED_HEADER_LENGTH + b'\n')
+
+    after = _detect_header_format.cache_info()
+    assert (after.hits, after.misses, after.currsize) == (info.hits, info.misses, info.currsize)
+
+
+# ==================== Validation ====================
+
+@pytest.mark.parametrize("parser", [AceMoneyParser(), DanskeBankParser()])
+def test_validate_empty_file(parser):
+    """validate() and parse() report the same error for an empty file"""
+    assert parser.validate(b"  \n") == ["File is empty"]
+    with pytest.raises(ValueError, match="CSV validation failed: File is empty"):
+        parser.parse(b"  \n")
+
+
+def test_acemoney_invalid_headers():
+    """Files with wrong headers fail validation and parsing alike"""
+    content = b"transaction,date,payee\n,21.07.2023,Shop\n"
+
+    errors = AceMoneyParser().validate(content)
+    assert len(errors) == 1 and errors[0].startswith("Invalid headers.")
+    with pytest.raises(ValueError, match="CSV validation failed: Invalid headers"):
+        AceMoneyParser().parse(content)
+
+
+def test_danske_bank_invalid_headers():
+    """Missing required Danske Bank headers fail validation and parsing alike"""
+    content = '"Dato";"Beløb"\n"21.07.2023";"-1,00"\n'.encode('utf-8')
+
+    assert DanskeBankParser().validate(content) == [
+        "Invalid headers. Expected: Dato; Tekst; Beløb; Saldo; Status; Afstemt"
+    ]
+    with pytest.raises(ValueError, match="CSV validation failed: Invalid headers"):
+        DanskeBankParser().parse(content)
+
+
+def test_valid_file_parses_after_header_check():
+    """The reader that checked the headers continues with the data rows"""
+    content = acemoney_csv(",21.07.2023,Shop,,,1.00,,,")
+
+    assert AceMoneyParser().validate(content) == []
+    assert AceMoneyParser().parse(content) == [
+        ParsedTransaction(date='2023-07-21', payee='Shop', amount=-1.0)
+    ]
+
+
+# ==================== Rows ====================
+
+def test_parse_acemoney_rows():
+    """Withdrawals become negative amounts, deposits positive; category and comment are kept"""
+    transactions = AceMoneyParser().parse(acemoney_csv(
+        ",21.07.2023,DSB NETBUTIK,,,160.0,,,",
+        ",27.07.2023,Lønoverførsel,Salary,,,28511.61,,monthly",
+    ))
+
+    assert transactions == [
+        ParsedTransaction(date='2023-07-21', payee='DSB NETBUTIK', amount=-160.0),
+        ParsedTransaction(date='2023-07-27', payee='Lønoverførsel', amount=28511.61,
+                          original_category='Salary', original_comment='monthly'),
+    ]
+
+
+def test_parse_acemoney_skips_blank_and_memo_rows():
+    """Blank lines and rows without an amount are skipped (blank lines are not numbered)"""
+    content = acemoney_csv(
+        ",21.07.2023,Shop,,,1.00,,,",
+        "",
+        ",22.07.2023,Memo only,,,,,,",
+        ",23.07.2023,,,,2.00,,,",
+    )
+
+    with pytest.raises(ValueError, match="Row 4: Missing payee"):
+        AceMoneyParser().parse(content)
+
+
+def test_parse_acemoney_both_amounts():
+    """A row with both withdrawal and deposit is rejected"""
+    with pytest.raises(ValueError, match="Row 2: Both withdrawal and deposit have values"):
+        AceMoneyParser().parse(acemoney_csv(",21.07.2023,Shop,,,1.00,2.00,,"))
+
+
+def test_parse_acemoney_missing_columns():
+    """Short rows raise a 'Missing columns' error instead of crashing"""
+    with pytest.raises(ValueError, match=r"Row 2: Missing columns \(found 3 of 9\)"):
+        AceMoneyParser().parse(acemoney_csv(",21.07.2023,Shop"))
+
+
+@pytest.mark.parametrize("encoding", ['utf-8', 'iso-8859-1'])
+def test_parse_danske_bank_rows(encoding):
+    """Danish decimal amounts are converted and the balance column is ignored"""
+    content = (DANSKE_BANK_HEADER
+               + '"21.07.2023";"Netto";"-1.234,56";"10.000,00";"Udført";""\r\n'
+               + '\r\n'
+               + '"22.07.2023";"Løn";"28.511,61";"38.511,61";"Udført";""\r\n'
+               + '"23.07.2023";"Memo";"";"38.511,61";"";""\r\n').encode(encoding)
+
+    assert DanskeBankParser().parse(content) == [
+        ParsedTransaction(date='2023-07-21', payee='Netto', amount=-1234.56),
+        ParsedTransaction(date='2023-07-22', payee='Løn', amount=28511.61),
+    ]
+
+
+def test_parse_danske_bank_reordered_columns():
+    """Danske Bank column positions come from the header row"""
+    content = '"Tekst";"Dato";"Status";"Saldo";"Beløb"\n"Netto";"21.07.2023";"";"0,00";"-41,80"\n'.encode('utf-8')
+
+    assert DanskeBankParser().parse(content) == [
+        ParsedTransaction(date='2023-07-21', payee='Netto', amount=-41.8),
+    ]
+
+
+def test_parse_danske_bank_missing_columns():
+    """Short rows raise a 'Missing columns' error"""
+    content = (DANSKE_BANK_HEADER + '"21.07.2023";"Netto"\r\n').encode('utf-8')
+
+    with pytest.raises(ValueError, match=r"Row 2: Missing columns \(found 2 of 6\)"):
+        DanskeBankParser().parse(content)
+
+
+# ==================== Dates ====================
+
+@pytest.mark.parametrize("date_str", ['05.02.2005', '05-02-2005', '2005/02/05', '2005-02-05', '5.2.2005', '2005/2/5'])
+def test_acemoney_date_formats(date_str):
+    """All supported date formats (zero-padded or not) parse to YYYY-MM-DD"""
+    transactions = AceMoneyParser().parse(acemoney_csv(f",{date_str},Shop,,,1.00,,,"))
+
+    assert transactions[0].date == '2005-02-05'
+
+
+@pytest.mark.parametrize("date_str", ['31.02.2023', '2023.07.21', '21/07/2023', '2l.07.2023'])
+def test_acemoney_malformed_date(date_str):
+    """Invalid dates are rejected with the row number"""
+    with pytest.raises(ValueError, match=f"Row 2: Invalid date format '{date_str}'"):
+        AceMoneyParser().parse(acemoney_csv(f",{date_str},Shop,,,1.00,,,"))
+
+
+@pytest.mark.parametrize("date_str, expected", [('21.07.2023', '2023-07-21'), ('1.7.2023', '2023-07-01')])
+def test_danske_bank_dates(date_str, expected):
+    """Danske Bank dates are DD.MM.YYYY, zero-padded or not"""
+    content = DANSKE_BANK_HEADER.encode('utf-8') + f'"{date_str}";"Netto";"-1,00";"0,00";"";""\r\n'.encode('utf-8')
+
+    assert DanskeBankParser().parse(content)[0].date == expected
+
+
+@pytest.mark.parametrize("date_str", ['29.02.2023', '2023-07-21', '٢١.07.2023'])
+def test_danske_bank_malformed_date(date_str):
+    """Invalid Danske Bank dates (including non-ASCII digits) are rejected with the row number"""
+    content = DANSKE_BANK_HEADER.encode('utf-8') + f'"{date_str}";"Netto";"-1,00";"0,00";"";""\r\n'.encode('utf-8')
+
+    with pytest.raises(ValueError, match="Row 2:"):
+        DanskeBankParser().parse(content)
+
+
+# ==================== Generation ====================
+
+def make_transaction(**fields) -> Transaction:
+    """Transaction record with defaults for the fields the generator ignores"""
+    values = dict(id=1, batch_id=1, date='2023-07-21', payee='Shop', amount=-1.0,
+                  category=None, note=None, status='uncategorized',
+                  created_at='', updated_at='')
+    values.update(fields)
+    return Transaction(**values)
+
+
+GENERATED_LINES = [
+    'transaction,date,payee,category,status,withdrawal,deposit,total,comment',
+    ',21.07.2023,Netto,Food:Groceries,,146.45,,,weekly',
+    ',27.07.2023,Lønoverførsel,,,,28511.61,,',
+]
+
+
+def test_generate_csv_from_records():
+    """Categories, notes and split amounts end up in the AceMoney columns"""
+    content = CSVGenerator().generate(iter([
+        make_transaction(date='2023-07-21', payee='Netto', amount=-146.45,
+                         category='Food:Groceries', note='weekly'),
+        make_transaction(date='2023-07-27', payee='Lønoverførsel', amount=28511.61),
+    ]))
+
+    assert content.decode('latin-1').splitlines() == GENERATED_LINES
+
+
+def test_generate_csv_from_dicts():
+    """Plain transaction dicts (category and note optional) are still accepted"""
+    content = CSVGenerator().generate([
+        {'date': '2023-07-21', 'payee': 'Netto', 'amount': -146.45,
+         'category': 'Food:Groceries', 'note': 'weekly'},
+        {'date': '2023-07-27', 'payee': 'Lønoverførsel', 'amount': 28511.61},
+    ])
+
+    assert content.decode('latin-1').splitlines() == GENERATED_LINES
+
+
+def test_generate_csv_roundtrip():
+    """Generated files parse back to the same transactions"""
+    content = CSVGenerator().generate([
+        make_transaction(date='2023-07-21', payee='Ålborg Kiosk', amount=-12.5, category='Food'),
+    ])
+
+    assert get_parser(content).parse(content) == [
+        ParsedTransaction(date='2023-07-21', payee='Ålborg Kiosk', amount=-12.5,
+                          original_category='Food'),
+    ]
+
+
+def test_csv_parser_does_not_import_database_layer():
+    """The parser module stays free of the database and settings imports"""
+    code = "import sys, app.services.csv_parser; print('app.database' in sys.modules)"
+    result = subprocess.run([sys.executable, '-c', code], cwd=Path(__file__).parents[1],
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == 'False'
@@ -0,0 +1,55 @@
+"""
+Tests for database setup and connection handling
+"""
+
+import sqlite3
+
+import pytest
+
+from app.config import settings
+from app.database import get_db_context, init_db
+from app.services.batch import create_batch
+from app.services.transaction import list_transactions
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point the app at a fresh database file"""
+    path = tmp_path / "test.db"
+    monkeypatch.setattr(settings, 'DATABASE_PATH', str(path))
+    init_db()
+    return path
+
+
+def has_statistics(path):
+    """Whether ANALYZE has stored planner statistics in the database"""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is not None
+    finally:
+        conn.close()
+
+
+def test_init_db_uses_wal(db_path):
+    """init_db switches the database to WAL journaling"""
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    finally:
+        conn.close()
+
+
+def test_statistics_gathered_when_connection_closes(db_path):
+    """PRAGMA optimize at close analyzes the tables the connection queried"""
+    assert not has_statistics(db_path)
+
+    with get_db_context() as db:
+        user_id = db.execute(
+            "INSERT INTO users (username, password_hash) VALUES ('test', 'x')"
+        ).lastrowid
+        batch_id = create_batch(db, "Batch", user_id, [
+            {'date': f'2023-07-{day:02d}', 'payee': 'Shop', 'amount': -1.0} for day in range(1, 29)
+        ])
+        list_transactions(db, batch_id, user_id)
+
+    assert has_statistics(db_path)
@@ -0,0 +1,57 @@
+"""
+Query plan checks for the hot transaction queries
+
+Each query must be answered by a seek on the expected index, and the listings
+must come back in order without a sort step. Only index names and step kinds
+are checked, since the exact plan wording differs between SQLite versions.
+"""
+
+import pytest
+
+from app.services.batch import SQL_BATCH_COMPLETION_PROBE
+from app.services.transaction import (
+    SQL_CATEGORY_EXISTS,
+    SQL_GET_TRANSACTION,
+    SQL_LIST_OWNED_TRANSACTIONS,
+    SQL_LIST_OWNED_TRANSACTIONS_BY_STATUS,
+    SQL_LIST_TRANSACTIONS,
+)
+
+
+def query_plan(db, sql):
+    """Return the detail lines of EXPLAIN QUERY PLAN (all parameters bound to 1)"""
+    params = (1,) * sql.count('?')
+    return [row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def assert_index_seeks(plan, index_name):
+    """The plan uses index_name and never scans a table or sorts in a temp B-tree"""
+    assert any(index_name in line for line in plan), plan
+    assert not any(line.startswith('SCAN') and 'CONSTANT ROW' not in line for line in plan), plan
+    assert not any('TEMP B-TREE' in line for line in plan), plan
+
+
+@pytest.mark.parametrize("sql, index_name", [
+    (SQL_LIST_TRANSACTIONS, 'idx_transactions_batch_date'),
+    (SQL_LIST_OWNED_TRANSACTIONS, 'idx_transactions_batch_date'),
+    (SQL_LIST_OWNED_TRANSACTIONS_BY_STATUS, 'idx_transactions_batch_status_date'),
+    (SQL_CATEGORY_EXISTS, 'sqlite_autoindex_categories_1'),
+    (SQL_GET_TRANSACTION, 'INTEGER PRIMARY KEY'),
+])
+def test_query_uses_index(db, sql, index_name):
+    """The query seeks on the expected index, with no scan or sort step"""
+    assert_index_seeks(query_plan(db, sql), index_name)
+
+
+@pytest.mark.parametrize("sql", [SQL_LIST_OWNED_TRANSACTIONS, SQL_LIST_OWNED_TRANSACTIONS_BY_STATUS])
+def test_owned_listing_seeks_batch_by_id(db, sql):
+    """The ownership JOIN looks the batch up by its id instead of scanning batches"""
+    batch_steps = [line for line in query_plan(db, sql) if ' b ' in f"{line} "]
+
+    assert len(batch_steps) == 1
+    assert 'rowid=?' in batch_steps[0] and not batch_steps[0].startswith('SCAN')
+
+
+def test_completion_probe_uses_batch_status_index(db):
+    """The "any uncategorized left?" probe is a seek on idx_transactions_batch_status_date"""
+    assert_index_seeks(query_plan(db, SQL_BATCH_COMPLETION_PROBE), 'idx_transactions_batch_status_date')
@@ -0,0 +1,67 @@
+"""
+Tests for the rule service
+"""
+
+import pytest
+
+from app.services.rule import create_rules_bulk, get_matching_transactions_for_rule, list_rules
+from app.services.transaction import get_transaction_by_id
+
+
+def test_create_rules_bulk(db, user_id, categories):
+    """All rules are inserted and the caller decides when to commit"""
+    count = create_rules_bulk(db, user_id, [
+        ('IKEA', 'contains', 'Food'),
+        ('Netto', 'exact', 'Food:Groceries'),
+    ])
+
+    assert count == 2
+    assert db.in_transaction
+    assert {(r['pattern'], r['match_type'], r['category']) for r in list_rules(db, user_id)} == {
+        ('IKEA', 'contains', 'Food'),
+        ('Netto', 'exact', 'Food:Groceries'),
+    }
+
+
+def test_create_rules_bulk_empty(db, user_id):
+    """An empty list creates nothing"""
+    assert create_rules_bulk(db, user_id, []) == 0
+
+
+def test_create_rules_bulk_unknown_category(db, user_id, categories):
+    """An unknown category rejects the whole list"""
+    with pytest.raises(ValueError, match="Category 'Nope' does not exist"):
+        create_rules_bulk(db, user_id, [
+            ('IKEA', 'contains', 'Food'),
+            ('DSB', 'contains', 'Nope'),
+        ])
+
+    assert list_rules(db, user_id) == []
+
+
+def test_create_rules_bulk_bad_match_type(db, user_id, categories):
+    """An invalid match_type raises ValueError, not IntegrityError"""
+    with pytest.raises(ValueError, match="Invalid match_type 'regex'"):
+        create_rules_bulk(db, user_id, [
+            ('IKEA', 'contains', 'Food'),
+            ('IK.A', 'regex', 'Food'),
+        ])
+
+    assert list_rules(db, user_id) == []
+
+
+def test_preview_matching_transactions(db, user_id, batch_id):
+    """Preview rows carry every transaction column plus the batch name"""
+    matches = get_matching_transactions_for_rule(db, user_id, 'net', 'contains')
+
+    assert len(matches) == 1
+    preview = matches[0]
+    assert preview['batch_name'] == 'Test Batch'
+    assert {k: v for k, v in preview.items() if k != 'batch_name'} == get_transaction_by_id(db, preview['id'])
+    assert preview['payee'] == 'Netto' and preview['amount'] == -146.45
+
+
+def test_preview_exact_match_is_case_insensitive(db, user_id, batch_id):
+    """Exact matching ignores case but requires the whole payee"""
+    assert [t['payee'] for t in get_matching_transactions_for_rule(db, user_id, 'dsb', 'exact')] == ['DSB']
+    assert get_matching_transactions_for_rule(db, user_id, 'ds', 'exact') == []
@@ -0,0 +1,175 @@
+"""
+Tests for the transaction service
+"""
+
+import pytest
+
+from app.services.batch import create_batch, get_batch_by_id
+from app.services.category import get_category_by_full_path
+from app.services.transaction import (
+    Transaction,
+    bulk_update_transactions,
+    iter_transactions,
+    list_transactions,
+    update_transaction,
+)
+
+
+def transaction_ids(db, batch_id, user_id):
+    """IDs of the batch's transactions in listing order"""
+    return [txn['id'] for txn in list_transactions(db, batch_id, user_id)]
+
+
+# ==================== Bulk update ====================
+
+def test_bulk_update_success(db, user_id, categories, batch_id):
+    """All listed transactions get the category and the batch completes"""
+    ids = transaction_ids(db, batch_id, user_id)
+
+    assert bulk_update_transactions(db, ids, category='Food', note='bulk') == 3
+
+    for txn in list_transactions(db, batch_id, user_id):
+        assert (txn['category'], txn['note'], txn['status']) == ('Food', 'bulk', 'categorized')
+    assert get_batch_by_id(db, batch_id)['status'] == 'complete'
+    assert get_category_by_full_path(db, 'Food')['usage_count'] == 3
+
+
+def test_bulk_update_skips_missing_ids(db, user_id, categories, batch_id):
+    """Unknown IDs are skipped and not counted"""
+    ids = transaction_ids(db, batch_id, user_id)
+
+    assert bulk_update_transactions(db, ids + [999999], category='Food') == 3
+
+
+def test_bulk_update_clear_category(db, user_id, categories, batch_id):
+    """Clearing the category marks transactions uncategorized again"""
+    ids = transaction_ids(db, batch_id, user_id)
+    bulk_update_transactions(db, ids, category='Food')
+
+    assert bulk_update_transactions(db, ids[:1], category=None) == 1
+
+    txn = list_transactions(db, batch_id, user_id)[0]
+    assert (txn['category'], txn['status']) == (None, 'uncategorized')
+
+
+def test_bulk_update_unknown_category(db, user_id, categories, batch_id):
+    """An unknown category is rejected before anything is updated"""
+    ids = transaction_ids(db, batch_id, user_id)
+
+    with pytest.raises(ValueError, match="Category 'Nope' does not exist"):
+        bulk_update_transactions(db, ids, category='Nope')
+
+    assert all(txn['status'] == 'uncategorized' for txn in list_transactions(db, batch_id, user_id))
+
+
+def test_bulk_update_no_ids(db):
+    """An empty ID list is rejected"""
+    with pytest.raises(ValueError, match="No transaction IDs provided"):
+        bulk_update_transactions(db, [], category='Food')
+
+
+def test_bulk_update_duplicate_ids(db, user_id, categories, batch_id):
+    """Duplicate IDs are applied (and counted) once per occurrence, as before"""
+    first, second, _ = transaction_ids(db, batch_id, user_id)
+
+    assert bulk_update_transactions(db, [first, first, second], category='Food') == 3
+
+    statuses = {txn['id']: txn['status'] for txn in list_transactions(db, batch_id, user_id)}
+    assert statuses[first] == statuses[second] == 'categorized'
+    assert get_batch_by_id(db, batch_id)['status'] == 'in_progress'
+    assert get_category_by_full_path(db, 'Food')['usage_count'] == 3
+
+
+def test_bulk_update_completes_every_touched_batch(db, user_id, categories, batch_id):
+    """IDs from several batches are looked up in one query and each batch is checked"""
+    other_batch_id = create_batch(db, "Other Batch", user_id, [
+        {'date': '2023-08-01', 'payee': 'Kiosk', 'amount': -10.0},
+    ])
+    ids = transaction_ids(db, batch_id, user_id) + transaction_ids(db, other_batch_id, user_id)
+
+    assert bulk_update_transactions(db, ids, category='Food') == 4
+
+    assert get_batch_by_id(db, batch_id)['status'] == 'complete'
+    assert get_batch_by_id(db, other_batch_id)['status'] == 'complete'
+
+
+def test_bulk_update_many_ids(db, user_id, categories):
+    """More IDs than SQLite's bound-parameter limit are handled (IDs are bound as one JSON array)"""
+    batch_id = create_batch(db, "Large Batch", user_id, [
+        {'date': '2023-07-21', 'payee': f'Payee {i}', 'amount': -1.0} for i in range(40000)
+    ])
+    ids = transaction_ids(db, batch_id, user_id)
+
+    assert bulk_update_transactions(db, ids, category='Food') == 40000
+    assert get_batch_by_id(db, batch_id)['status'] == 'complete'
+
+
+# ==================== Single update ====================
+
+def test_update_transaction_sets_category(db, user_id, categories, batch_id):
+    """Setting a category marks the transaction categorized and counts the usage"""
+    txn_id = transaction_ids(db, batch_id, user_id)[0]
+
+    txn = update_transaction(db, txn_id, category='Food:Groceries', note='weekly')
+
+    assert (txn['category'], txn['note'], txn['status']) == ('Food:Groceries', 'weekly', 'categorized')
+    assert get_category_by_full_path(db, 'Food:Groceries')['usage_count'] == 1
+    assert get_batch_by_id(db, batch_id)['status'] == 'in_progress'
+    assert not db.in_transaction
+
+
+def test_update_transaction_clears_category(db, user_id, categories, batch_id):
+    """Clearing the category marks it uncategorized without touching usage counts"""
+    txn_id = transaction_ids(db, batch_id, user_id)[0]
+    update_transaction(db, txn_id, category='Food')
+
+    txn = update_transaction(db, txn_id, category=None, note='later')
+
+    assert (txn['category'], txn['note'], txn['status']) == (None, 'later', 'uncategorized')
+    assert get_category_by_full_path(db, 'Food')['usage_count'] == 1
+
+
+def test_update_last_transaction_completes_batch(db, user_id, categories, batch_id):
+    """Categorizing the last uncategorized transaction completes the batch"""
+    for txn_id in transaction_ids(db, batch_id, user_id):
+        update_transaction(db, txn_id, category='Food')
+
+    assert get_batch_by_id(db, batch_id)['status'] == 'complete'
+
+
+def test_update_transaction_errors(db, user_id, categories, batch_id):
+    """Unknown transactions and categories raise ValueError"""
+    txn_id = transaction_ids(db, batch_id, user_id)[0]
+
+    with pytest.raises(ValueError, match="Transaction 999999 not found"):
+        update_transaction(db, 999999, category='Food')
+    with pytest.raises(ValueError, match="Category 'Nope' does not exist"):
+        update_transaction(db, txn_id, category='Nope')
+
+
+# ==================== Streaming ====================
+
+def test_iter_transactions_checks_ownership_first(db, user_id, batch_id):
+    """The ownership error is raised by the call itself, before any row is fetched"""
+    other_user_id = db.execute(
+        "INSERT INTO users (username, password_hash) VALUES ('other', 'x')"
+    ).lastrowid
+
+    with pytest.raises(ValueError, match="Batch not found or you don't have permission to view it"):
+        iter_transactions(db, batch_id, other_user_id)
+
+
+def test_iter_transactions_order_across_chunks(db, user_id):
+    """Rows stay in date, id order across fetchmany chunks"""
+    # Dates deliberately out of insertion order, with many ties
+    rows = [
+        {'date': f'2023-{1 + i * 7 % 12:02d}-{1 + i * 5 % 28:02d}', 'payee': f'Payee {i}', 'amount': -1.0}
+        for i in range(1200)
+    ]
+    batch_id = create_batch(db, "Large Batch", user_id, rows)
+
+    streamed = list(iter_transactions(db, batch_id, user_id, chunk_size=500))
+
+    assert len(streamed) == 1200
+    assert [(t.date, t.id) for t in streamed] == sorted((t.date, t.id) for t in streamed)
+    assert streamed == [Transaction(**txn) for txn in list_transactions(db, batch_id, user_id)]
@@ -30,8 +30,10 @@ try:
     print(f"  Amount: {t.amount}")
 
     print("\nAll transactions:")
-    for i, t in enumerate(transactions):
-        print(f"  {i+1}. {t.date} | {t.payee:30s} | {t.amount:10.2f}")
+    print('\n'.join(
+        f"  {i+1}. {t.date} | {t.payee:30s} | {t.amount:10.2f}"
+        for i, t in enumerate(transactions)
+    ))
 
 except Exception as e:
     print(f"Error: {e}")